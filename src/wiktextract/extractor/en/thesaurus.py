@@ -3,6 +3,7 @@
 #
 # Copyright (c) 2021 Tatu Ylonen.  See file LICENSE and https://ylonen.org
 
+import functools
 import logging
 import re
 from typing import (
@@ -13,68 +14,105 @@ from typing import (
 
 from mediawiki_langcodes import code_to_name, name_to_code
 from wikitextprocessor import NodeKind, Page, WikiNode
-from wikitextprocessor.core import NamespaceDataEntry
 from wiktextract.datautils import ns_title_prefix_tuple
 from wiktextract.form_descriptions import parse_sense_qualifier
 from wiktextract.page import LEVEL_KINDS, clean_node
 from wiktextract.thesaurus import ThesaurusTerm
 from wiktextract.wxr_context import WiktextractContext
 
-IGNORED_SUBTITLE_TAGS_MAP: dict[str, list[str]] = {
-    "by reason": [],
-    "by period of time": [],
-    "by degree": [],
-    "by type": [],
-    "other": [],
-    "opaque slang terms": ["slang"],
-    "slang": ["slang"],
-    "colloquial, archaic, slang": ["colloquial", "archaic", "slang"],
-    "euphemisms": ["euphemism"],
-    "colloquialisms": ["colloquial"],
-    "colloquialisms or slang": ["colloquial"],
-    "technical terms misused": ["colloquial"],
-    "people": [],
-    "proper names": ["proper-noun"],
-    "race-based (warning- offensive)": ["offensive"],
-    "substance addicts": [],
-    "non-substance addicts": [],
-    "echoing sounds": [],
-    "movement sounds": [],
-    "impacting sounds": [],
-    "destructive sounds": [],
-    "noisy sounds": [],
-    "vocal sounds": [],
-    "miscellaneous sounds": [],
-    "age and gender": [],
-    "breeds and types": [],
-    "by function": [],
-    "wild horses": [],
-    "body parts": [],
-    "colors, patterns and markings": [],
-    "diseases": [],
-    "equipment and gear": [],
-    "groups": [],
-    "horse-drawn vehicles": [],
-    "places": [],
-    "sports": [],
-    "sounds and behavior": [],
-    "obscure derivations": [],
-    "plants": [],
-    "animals": [],
-    "common": [],
-    "rare": ["rare"],
+IGNORED_SUBTITLE_TAGS_MAP: dict[str, tuple[str, ...]] = {
+    "by reason": (),
+    "by period of time": (),
+    "by degree": (),
+    "by type": (),
+    "other": (),
+    "opaque slang terms": ("slang",),
+    "slang": ("slang",),
+    "colloquial, archaic, slang": ("colloquial", "archaic", "slang"),
+    "euphemisms": ("euphemism",),
+    "colloquialisms": ("colloquial",),
+    "colloquialisms or slang": ("colloquial",),
+    "technical terms misused": ("colloquial",),
+    "people": (),
+    "proper names": ("proper-noun",),
+    "race-based (warning- offensive)": ("offensive",),
+    "substance addicts": (),
+    "non-substance addicts": (),
+    "echoing sounds": (),
+    "movement sounds": (),
+    "impacting sounds": (),
+    "destructive sounds": (),
+    "noisy sounds": (),
+    "vocal sounds": (),
+    "miscellaneous sounds": (),
+    "age and gender": (),
+    "breeds and types": (),
+    "by function": (),
+    "wild horses": (),
+    "body parts": (),
+    "colors, patterns and markings": (),
+    "diseases": (),
+    "equipment and gear": (),
+    "groups": (),
+    "horse-drawn vehicles": (),
+    "places": (),
+    "sports": (),
+    "sounds and behavior": (),
+    "obscure derivations": (),
+    "plants": (),
+    "animals": (),
+    "common": (),
+    "rare": ("rare",),
 }
 
+# Sections that don't contain thesaurus terms, their children are skipped
+SKIPPED_SUBTITLES = frozenset(
+    {
+        "further reading",
+        "external links",
+        "references",
+        "translations",
+        "notes",
+        "usage",
+        "work to be done",
+        "quantification",
+        "abbreviation",
+        "symbol",
+    }
+)
+
+xlits_span_re = re.compile(
+    r'(?s)<span class="tr Latn"[^>]*>(<b>)?(.*?)(</b>)?' r"</span>"
+)
+sense_prefix_re = re.compile(r"(?s)^\(([^)]*)\):\s*(.*)$")
+ws_link_re = re.compile(r"\s*\[W[Ss]\]")
+english_re = re.compile(r'(\bliterally\s*)?(, )?“([^"]*)"\s*')
+qualifier_re = re.compile(r"\(([^)]*)\)$")
+# One comma-separated term, optionally followed by its transliteration
+term_re = re.compile(r"([^,]*?)\s*(?:XLITS([^,]*?)XLITE[^,]*)?(?:,|\Z)")
+ws_header_re = re.compile(r"(?s)\{\{ws header\|[^}]*lang=([^}|]*)")
+
+
+# mediawiki_langcodes only keeps a small cache of its database queries,
+# which every subtitle of every page would otherwise evict
+@functools.lru_cache(maxsize=4096)
+def english_name_to_code(name: str) -> str:
+    return name_to_code(name, "en")
+
+
+@functools.lru_cache(maxsize=4096)
+def code_to_english_name(code: str) -> str:
+    return code_to_name(code, "en")
+
 
 def extract_thesaurus_page(
     wxr: WiktextractContext, page: Page
 ) -> Optional[list[ThesaurusTerm]]:
     """Extracts linkages from the thesaurus pages in Wiktionary."""
 
-    thesaurus_ns_data: NamespaceDataEntry
-    thesaurus_ns_data = wxr.wtp.NAMESPACE_DATA["Thesaurus"]
-
-    thesaurus_ns_local_name = thesaurus_ns_data["name"]
+    thesaurus_prefixes = ns_title_prefix_tuple(wxr, "Thesaurus")
+    # Length of the local namespace name and the colon
+    thesaurus_prefix_len = len(thesaurus_prefixes[0])
 
     title = page.title
     text = page.body
@@ -84,207 +122,181 @@ def extract_thesaurus_page(
     if "/" in title:
         # print("STRANGE TITLE:", title)
         return None
-    word = title[len(thesaurus_ns_local_name) + 1 :]
+    word = title[thesaurus_prefix_len:]
     idx = word.find(":")
     if idx > 0 and idx < 5:
         word = word[idx + 1 :]  # Remove language prefix
     expanded = wxr.wtp.expand(text, templates_to_expand=None)  # Expand all
-    expanded = re.sub(
-        r'(?s)<span class="tr Latn"[^>]*>(<b>)?(.*?)(</b>)?' r"</span>",
-        r"XLITS\2XLITE",
-        expanded,
-    )
+    if '<span class="tr Latn"' in expanded:
+        expanded = xlits_span_re.sub(r"XLITS\2XLITE", expanded)
     tree = wxr.wtp.parse(expanded, pre_expand=False)
     assert tree.kind == NodeKind.ROOT
     lang = None
     pos = None
     sense = None
     linkage = None
-    subtitle_tags = []
-    entry_id = -1
     # Some pages don't have a language subtitle, but use
     # {{ws header|lang=xx}}
-    m = re.search(r"(?s)\{\{ws header\|[^}]*lang=([^}|]*)", text)
+    m = ws_header_re.search(text)
     if m:
-        lang = code_to_name(m.group(1), "en")
-
-    def recurse(contents) -> Optional[list[ThesaurusTerm]]:
-        nonlocal lang
-        nonlocal pos
-        nonlocal sense
-        nonlocal linkage
-        nonlocal subtitle_tags
-        nonlocal entry_id
-        item_sense = None
-        tags = None
-        topics = None
-
-        if isinstance(contents, (list, tuple)):
-            thesaurus = []
-            for x in contents:
-                x_result = recurse(x)
-                if x_result is not None:
-                    thesaurus.extend(x_result)
-            return thesaurus
-        if not isinstance(contents, WikiNode):
-            return None
-        kind = contents.kind
-        if kind == NodeKind.LIST and not contents.contain_node(NodeKind.LIST):
-            if lang is None:
-                logging.debug(
-                    f"{title=} {lang=} UNEXPECTED LIST WITHOUT LANG: "
-                    + str(contents)
-                )
-                return None
-            thesaurus = []
-            for node in contents.children:
-                if isinstance(node, str) or node.kind != NodeKind.LIST_ITEM:
-                    continue
-                w = clean_node(wxr, None, node.children)
-                if "*" in w:
-                    logging.debug(f"{title=} {lang=} {pos=} STAR IN WORD: {w}")
-                # Check for parenthesized sense at the beginning
-                m = re.match(r"(?s)^\(([^)]*)\):\s*(.*)$", w)
-                if m:
-                    item_sense, w = m.groups()
-                    # XXX check for item_sense being part-of-speech
-                else:
-                    item_sense = sense
-
-                # Remove thesaurus links, if any
-                w = re.sub(r"\s*\[W[Ss]\]", "", w)
+        lang = code_to_english_name(m.group(1))
 
-                # Check for English translation in quotes.  This can be
-                # literal translation, not necessarily the real meaning.
-                english = None
+    if TYPE_CHECKING:
+        assert isinstance(wxr.config.OTHER_SUBTITLES["sense"], str)
+    sense_prefix = wxr.config.OTHER_SUBTITLES["sense"]
+    sense_prefix_lower = sense_prefix.lower()
+    thesaurus: list[ThesaurusTerm] = []
 
-                def engl_fn(m):
-                    nonlocal english
-                    english = m.group(1)
-                    return ""
+    def process_list(contents: WikiNode) -> None:
+        if lang is None:
+            logging.debug(
+                f"{title=} {lang=} UNEXPECTED LIST WITHOUT LANG: "
+                + str(contents)
+            )
+            return
+        lang_code = english_name_to_code(lang)
+        if lang_code is None:
+            logging.debug(f"Linkage language {lang} not recognized")
+        rel = linkage or "synonyms"
+        start = len(thesaurus)
+        for node in contents.children:
+            if isinstance(node, str) or node.kind != NodeKind.LIST_ITEM:
+                continue
+            w = clean_node(wxr, None, node.children)
+            if "*" in w:
+                logging.debug(f"{title=} {lang=} {pos=} STAR IN WORD: {w}")
+            # Check for parenthesized sense at the beginning
+            m = sense_prefix_re.match(w)
+            if m:
+                item_sense, w = m.groups()
+                # XXX check for item_sense being part-of-speech
+            else:
+                item_sense = sense
 
-                w = re.sub(r'(\bliterally\s*)?(, )?“([^"]*)"\s*', engl_fn, w)
+            # Remove thesaurus links, if any
+            if "[W" in w:
+                w = ws_link_re.sub("", w)
 
-                # Check for qualifiers in parentheses
-                tags = []
-                topics = []
+            # Remove English translation in quotes.  This can be
+            # literal translation, not necessarily the real meaning.
+            if "“" in w:
+                w = english_re.sub("", w)
 
-                def qual_fn(m):
-                    q = m.group(1)
-                    if q == item_sense:
-                        return ""
-                    if "XLITS" in q:
-                        return q
+            # Check for qualifiers in parentheses
+            tags = None
+            topics = None
+            m = qualifier_re.search(w) if ")" in w else None
+            if m:
+                q = m.group(1)
+                if q == item_sense:
+                    q = ""
+                elif "XLITS" not in q:
                     dt = {}
                     parse_sense_qualifier(wxr, q, dt)
-                    tags.extend(dt.get("tags", ()))
-                    topics.extend(dt.get("topics", ()))
-                    return ""
-
-                w = re.sub(r"\(([^)]*)\)$", qual_fn, w).strip()
+                    tags = dt.get("tags")
+                    topics = dt.get("topics")
+                    q = ""
+                # A transliteration is kept without the parentheses
+                w = w[: m.start()] + q + w[m.end() :]
+            w = w.strip()
 
-                # XXX there could be a transliteration, e.g.
-                # Thesaurus:老百姓
+            # XXX there could be a transliteration, e.g.
+            # Thesaurus:老百姓
 
-                # XXX Apparently there can also be alternative spellings,
-                # such as 眾人／众人 on Thesaurus:老百姓
+            # XXX Apparently there can also be alternative spellings,
+            # such as 眾人／众人 on Thesaurus:老百姓
 
-                # If the word is now empty or separator, skip
-                if not w or w.startswith("---") or w == "\u2014":
-                    return None
-                rel = linkage or "synonyms"
-                for w1 in w.split(","):
-                    m = re.match(r"(?s)(.*?)\s*XLITS(.*?)XLITE\s*", w1)
-                    if m:
-                        w1, xlit = m.groups()
-                    else:
-                        xlit = None
-                    w1 = w1.strip()
-                    if w1.startswith(ns_title_prefix_tuple(wxr, "Thesaurus")):
-                        w1 = w1[10:]
-                    w1 = w1.removesuffix(" [⇒ thesaurus]")
+            # If the word is now empty or separator, skip the rest of the
+            # list and drop the terms already collected from it
+            if not w or w.startswith("---") or w == "\u2014":
+                del thesaurus[start:]
+                return
+            if "XLITS" in w:
+                terms = (m.groups() for m in term_re.finditer(w))
+            else:
+                terms = ((w1, None) for w1 in w.split(","))
+            for w1, xlit in terms:
+                w1 = w1.strip()
+                if not w1:
+                    continue
+                if w1.startswith(thesaurus_prefixes):
+                    w1 = w1[thesaurus_prefix_len:]
+                w1 = w1.removesuffix(" [⇒ thesaurus]")
 
-                    if w1:
-                        lang_code = name_to_code(lang, "en")
-                        if lang_code is None:
-                            logging.debug(
-                                f"Linkage language {lang} not recognized"
-                            )
-                        thesaurus.append(
-                            ThesaurusTerm(
-                                entry=word,
-                                language_code=lang_code,
-                                pos=pos,
-                                linkage=rel,
-                                term=w1,
-                                tags="|".join(tags) if tags else None,
-                                topics="|".join(topics) if topics else None,
-                                roman=xlit,
-                                sense=item_sense,
-                            )
+                if w1:
+                    thesaurus.append(
+                        ThesaurusTerm(
+                            entry=word,
+                            language_code=lang_code,
+                            pos=pos,
+                            linkage=rel,
+                            term=w1,
+                            tags="|".join(tags) if tags else None,
+                            topics="|".join(topics) if topics else None,
+                            roman=xlit,
+                            sense=item_sense,
                         )
-            return thesaurus
+                    )
+
+    # Walk the tree depth-first with an explicit stack.  Nodes are visited
+    # in document order, so the language, part-of-speech, sense and linkage
+    # set by a subtitle apply to the lists that follow it.
+    stack = [tree]
+    while len(stack) > 0:
+        contents = stack.pop()
+        if isinstance(contents, (list, tuple)):
+            stack.extend(reversed(contents))
+            continue
+        if not isinstance(contents, WikiNode):
+            continue
+        kind = contents.kind
+        if kind == NodeKind.LIST and not contents.contain_node(NodeKind.LIST):
+            process_list(contents)
+            continue
         if kind not in LEVEL_KINDS:
-            thesaurus = []
-            args_thesaurus = recurse(
-                contents.sarg if contents.sarg else contents.largs
-            )
-            if args_thesaurus is not None:
-                thesaurus.extend(args_thesaurus)
-            children_thesaurus = recurse(contents.children)
-            if children_thesaurus is not None:
-                thesaurus.extend(children_thesaurus)
-            return thesaurus
+            stack.extend(reversed(contents.children))
+            # sarg is a plain string, only largs can contain lists
+            if not contents.sarg:
+                stack.extend(reversed(contents.largs))
+            continue
         subtitle = wxr.wtp.node_to_text(
             contents.sarg if contents.sarg else contents.largs
         )
-        if name_to_code(subtitle, "en") != "":
+        if english_name_to_code(subtitle) != "":
             lang = subtitle
             pos = None
             sense = None
             linkage = None
-            return recurse(contents.children)
-        if TYPE_CHECKING:
-            assert isinstance(wxr.config.OTHER_SUBTITLES["sense"], str)
-        if subtitle.lower().startswith(
-            wxr.config.OTHER_SUBTITLES["sense"].lower()
-        ):
-            sense = subtitle[len(wxr.config.OTHER_SUBTITLES["sense"]) :]
+            stack.extend(reversed(contents.children))
+            continue
+        if subtitle.lower().startswith(sense_prefix_lower):
+            sense = subtitle[len(sense_prefix) :]
             linkage = None
-            return recurse(contents.children)
+            stack.extend(reversed(contents.children))
+            continue
 
         subtitle = subtitle.lower()
-        if subtitle in (
-            "further reading",
-            "external links",
-            "references",
-            "translations",
-            "notes",
-            "usage",
-            "work to be done",
-            "quantification",
-            "abbreviation",
-            "symbol",
-        ):
-            return None
+        if subtitle in SKIPPED_SUBTITLES:
+            continue
         if subtitle in wxr.config.LINKAGE_SUBTITLES:
             linkage = wxr.config.LINKAGE_SUBTITLES[subtitle]
-            return recurse(contents.children)
+            stack.extend(reversed(contents.children))
+            continue
         if subtitle in wxr.config.POS_SUBTITLES:
             pos = wxr.config.POS_SUBTITLES[subtitle]["pos"]
             sense = None
             linkage = None
-            return recurse(contents.children)
+            stack.extend(reversed(contents.children))
+            continue
         if subtitle in IGNORED_SUBTITLE_TAGS_MAP:
-            # These subtitles are ignored but children are processed and
-            # possibly given additional tags
-            subtitle_tags = IGNORED_SUBTITLE_TAGS_MAP[subtitle]
-            return recurse(contents.children)
+            # These subtitles are ignored but children are processed
+            stack.extend(reversed(contents.children))
+            continue
         logging.debug(
             f"{title=} {lang=} {pos=} {sense=} UNHANDLED SUBTITLE: "
             + "subtitle "
             + str(contents.sarg if contents.sarg else contents.largs)
         )
-        return recurse(contents.children)
+        stack.extend(reversed(contents.children))
 
-    return recurse(tree)
+    return thesaurus
@@ -20,16 +20,19 @@ def extract_linkage(
         )
         return
 
-    for link_node in node.find_child_recursively(NodeKind.LINK):
-        word = clean_node(wxr, {}, link_node)
+    for link_or_template_node in node.find_child_recursively(
+        NodeKind.LINK | NodeKind.TEMPLATE
+    ):
+        if (
+            link_or_template_node.kind == NodeKind.TEMPLATE
+            and link_or_template_node.template_name != "l"
+        ):
+            continue
+        word = clean_node(wxr, {}, link_or_template_node)
         if word:
-            getattr(data_container, linkage_type).append(Linkage(word=word))
-
-    for template_node in node.find_child_recursively(NodeKind.TEMPLATE):
-        if template_node.template_name == "l":
-            word = clean_node(wxr, {}, template_node)
-            if word:
-                getattr(data_container, linkage_type).append(Linkage(word=word))
+            getattr(data_container, linkage_type).append(
+                Linkage.model_construct(word=word)
+            )
 
 
 def process_linkage_template(
@@ -47,25 +50,24 @@ def process_linkage_template(
         )
         return
 
+    linkages = getattr(data_container, linkage_type)
     for key, value_raw in template_node.template_parameters.items():
         value = clean_node(wxr, {}, value_raw)
         if isinstance(key, int):
-            getattr(data_container, linkage_type).append(Linkage(word=value))
+            linkages.append(Linkage.model_construct(word=value))
 
         elif isinstance(key, str):
             if key.startswith("nota"):
                 idx = int(key[4:]) - 1 if len(key) > 4 else 0
 
-                if len(getattr(data_container, linkage_type)) > idx:
-                    getattr(data_container, linkage_type)[idx].note = value
+                if len(linkages) > idx:
+                    linkages[idx].note = value
 
             elif key.startswith("alt"):
                 idx = int(key[3:]) - 1 if len(key) > 3 else 0
 
-                if len(getattr(data_container, linkage_type)) > idx:
-                    getattr(data_container, linkage_type)[
-                        idx
-                    ].alternative_spelling = value
+                if len(linkages) > idx:
+                    linkages[idx].alternative_spelling = value
 
 
 def process_linkage_list_children(
@@ -84,4 +86,6 @@ def process_linkage_list_children(
         if isinstance(node, WikiNode) and node.kind == NodeKind.LINK:
             word = clean_node(wxr, {}, node)
             if word:
-                getattr(data_container, linkage_type).append(Linkage(word=word))
+                getattr(data_container, linkage_type).append(
+                    Linkage.model_construct(word=word)
+                )
@@ -4,7 +4,9 @@ from pydantic import BaseModel, ConfigDict, Field
 
 
 class BaseModelWrap(BaseModel):
-    model_config = ConfigDict(validate_assignment=True, extra="forbid")
+    # Fields are only assigned cleaned strings and already validated models
+    # by the extractor, don't validate them again on every assignment
+    model_config = ConfigDict(validate_assignment=False, extra="forbid")
 
 
 class Linkage(BaseModelWrap):
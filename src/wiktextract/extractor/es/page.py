@@ -1,10 +1,11 @@
-import copy
+import functools
 import logging
 import re
 
 from wikitextprocessor import NodeKind, WikiNode
 from wikitextprocessor.parser import WikiNodeChildrenList
 
+from wiktextract.config import WiktionaryConfig
 from wiktextract.extractor.es.etymology import process_etymology_block
 from wiktextract.extractor.es.example import extract_example
 from wiktextract.extractor.es.gloss import extract_gloss
@@ -19,6 +20,7 @@ from wiktextract.extractor.es.pronunciation import (
 )
 from wiktextract.extractor.es.sense_data import process_sense_data_list
 from wiktextract.extractor.es.translation import extract_translation
+from wiktextract.extractor.share import copy_base_data
 from wiktextract.page import clean_node
 from wiktextract.wxr_context import WiktextractContext
 
@@ -34,6 +36,32 @@ PANEL_PREFIXES = set()
 # Additional templates to be expanded in the pre-expand phase
 ADDITIONAL_EXPAND_TEMPLATES = set()
 
+# Nodes that start a new group of data about the preceding sense
+GROUP_KINDS = NodeKind.TEMPLATE | NodeKind.LIST | NodeKind.LINK
+
+EXAMPLE_TEMPLATES = frozenset({"ejemplo", "ejemplos", "ejemplo_y_trad"})
+
+# Sense templates that are not extracted yet
+IGNORED_SENSE_TEMPLATES = frozenset({"clear", "uso", "ámbito"})
+
+# Substrings of inflection and conjugation table template names
+INFLECTION_TEMPLATE_MARKERS = ("inflect", "v.conj")
+
+NUMBERED_ETYMOLOGY_RE = re.compile(r"etimología \d+")
+
+
+@functools.lru_cache(maxsize=4)
+def other_subtitle_sets(config: WiktionaryConfig) -> dict[str, frozenset[str]]:
+    """
+    Lowercased sets of the OTHER_SUBTITLES lists, built once per config and
+    compared against the lowercased section titles.
+    """
+    return {
+        key: frozenset(title.lower() for title in titles)
+        for key, titles in config.OTHER_SUBTITLES.items()
+        if isinstance(titles, list)
+    }
+
 
 def parse_entries(
     wxr: WiktextractContext,
@@ -64,29 +92,22 @@ def parse_entries(
 
     # This might not be necessary but it's to prevent that base_data is applied
     # to entries that it shouldn't be applied to
-    base_data_copy = copy.deepcopy(base_data)
+    base_data_copy = copy_base_data(base_data)
 
     unexpected_nodes = []
-    # Parse data affecting all subsections and add to base_data_copy
-    for not_sub_level_node in level_node.invert_find_child(next_level_kind):
-        if (
-            isinstance(not_sub_level_node, WikiNode)
-            and not_sub_level_node.kind == NodeKind.TEMPLATE
-            and not_sub_level_node.template_name == "pron-graf"
-        ):
+    sub_level_nodes = []
+    # Parse data affecting all subsections and add to base_data_copy, the
+    # subsections are parsed afterwards
+    for node in level_node.filter_empty_str_child():
+        kind = node.kind if isinstance(node, WikiNode) else None
+        if kind == next_level_kind:
+            sub_level_nodes.append(node)
+        elif kind == NodeKind.TEMPLATE and node.template_name == "pron-graf":
             if wxr.config.capture_pronunciation:
-                process_pron_graf_template(
-                    wxr, base_data_copy, not_sub_level_node
-                )
-        elif (
-            (isinstance(not_sub_level_node, WikiNode))
-            and not_sub_level_node.kind == NodeKind.LIST
-            and not_sub_level_node.sarg == ":*"
-        ):
+                process_pron_graf_template(wxr, base_data_copy, node)
+        elif kind == NodeKind.LIST and node.sarg == ":*":
             # XXX: There might be other uses for this kind of list which are being ignored here
-            for child in not_sub_level_node.find_child_recursively(
-                NodeKind.TEMPLATE
-            ):
+            for child in node.find_child_recursively(NodeKind.TEMPLATE):
                 if (
                     child.template_name == "audio"
                     and wxr.config.capture_pronunciation
@@ -94,7 +115,7 @@ def parse_entries(
                     process_audio_template(wxr, base_data_copy, child)
 
         else:
-            unexpected_nodes.append(not_sub_level_node)
+            unexpected_nodes.append(node)
 
     if unexpected_nodes:
         wxr.wtp.debug(
@@ -102,7 +123,7 @@ def parse_entries(
             sortid="extractor/es/page/parse_entries/69",
         )
 
-    for sub_level_node in level_node.find_child(next_level_kind):
+    for sub_level_node in sub_level_nodes:
         parse_section(wxr, page_data, base_data_copy, sub_level_node)
 
 
@@ -126,16 +147,17 @@ def parse_section(
 
     section_title = clean_node(wxr, base_data, level_node.largs).lower()
     wxr.wtp.start_subsection(section_title)
+    other_subtitles = other_subtitle_sets(wxr.config)
 
     pos_template_name = None
     for level_node_template in level_node.find_content(NodeKind.TEMPLATE):
         pos_template_name = level_node_template.template_name
 
     # XXX Handle numbered etymology sections.
-    if re.match(r"etimología \d+", section_title):
+    if NUMBERED_ETYMOLOGY_RE.match(section_title):
         parse_entries(wxr, page_data, base_data, level_node)
 
-    elif section_title in wxr.config.OTHER_SUBTITLES["ignored_sections"]:
+    elif section_title in other_subtitles["ignored_sections"]:
         pass
 
     elif (
@@ -147,7 +169,7 @@ def parse_section(
             pos_template_name if pos_template_name else section_title
         ]["pos"]
 
-        page_data.append(copy.deepcopy(base_data))
+        page_data.append(copy_base_data(base_data))
         page_data[-1].pos = pos_type
         page_data[-1].pos_title = section_title
 
@@ -157,11 +179,11 @@ def parse_section(
             level_node,
         )
 
-    elif section_title in wxr.config.OTHER_SUBTITLES["etymology"]:
+    elif section_title in other_subtitles["etymology"]:
         if wxr.config.capture_etymologies:
             process_etymology_block(wxr, base_data, level_node)
 
-    elif section_title in wxr.config.OTHER_SUBTITLES["translations"]:
+    elif section_title in other_subtitles["translations"]:
         if wxr.config.capture_translations:
             for template_node in level_node.find_child_recursively(
                 NodeKind.TEMPLATE
@@ -193,18 +215,13 @@ def process_pos_block(
     next sense is encountered or after the last sense has been processed.
     """
 
-    child_nodes = list(pos_level_node.filter_empty_str_child())
-
     sense_children: WikiNodeChildrenList = (
         []
     )  # All non-gloss nodes that add additional information to a sense
 
-    for child in child_nodes:
-        if (
-            isinstance(child, WikiNode)
-            and child.kind == NodeKind.LIST
-            and child.sarg == ";"
-        ):
+    for child in pos_level_node.filter_empty_str_child():
+        kind = child.kind if isinstance(child, WikiNode) else None
+        if kind == NodeKind.LIST and child.sarg == ";":
             # Consume sense_children of previous sense and extract gloss of new sense
             process_sense_children(wxr, page_data, sense_children)
             sense_children = []
@@ -216,22 +233,14 @@ def process_pos_block(
 
         else:
             # Process nodes before first sense
-            if (
-                isinstance(child, WikiNode)
-                and child.kind == NodeKind.TEMPLATE
-                and (
-                    "inflect" in child.template_name
-                    or "v.conj" in child.template_name
-                )
+            if kind == NodeKind.TEMPLATE and any(
+                marker in child.template_name
+                for marker in INFLECTION_TEMPLATE_MARKERS
             ):
                 # XXX: Extract forms
                 pass
 
-            elif (
-                isinstance(child, WikiNode)
-                and child.kind == NodeKind.LINK
-                and "Categoría" in child.largs[0][0]
-            ):
+            elif kind == NodeKind.LINK and "Categoría" in child.largs[0][0]:
                 clean_node(
                     wxr,
                     page_data[-1],
@@ -260,11 +269,7 @@ def process_sense_children(
 
     def starts_new_group(child: WikiNode) -> bool:
         # Nested function for readibility
-        return isinstance(child, WikiNode) and (
-            child.kind == NodeKind.TEMPLATE
-            or child.kind == NodeKind.LIST
-            or child.kind == NodeKind.LINK
-        )
+        return isinstance(child, WikiNode) and child.kind in GROUP_KINDS
 
     def process_group(
         wxr: WiktextractContext,
@@ -275,13 +280,12 @@ def process_sense_children(
 
         if len(group) == 0:
             return
-        elif (
-            isinstance(group[0], WikiNode)
-            and group[0].kind == NodeKind.TEMPLATE
-        ):
+        kind = group[0].kind if isinstance(group[0], WikiNode) else None
+        if kind == NodeKind.TEMPLATE:
             template_name = group[0].template_name
 
-            if template_name == "clear":
+            if template_name in IGNORED_SENSE_TEMPLATES:
+                # XXX: Extract usage and scope notes
                 return
             elif (
                 template_name.removesuffix("s") in wxr.config.LINKAGE_SUBTITLES
@@ -289,36 +293,26 @@ def process_sense_children(
                 process_linkage_template(
                     wxr, page_data[-1].senses[-1], group[0]
                 )
-            elif template_name in ["ejemplo", "ejemplos", "ejemplo_y_trad"]:
+            elif template_name in EXAMPLE_TEMPLATES:
                 extract_example(wxr, page_data[-1].senses[-1], group)
-            elif template_name == "uso":
-                # XXX: Extract usage note
-                pass
-            elif template_name == "ámbito":
-                # XXX Extract scope note
-                pass
             else:
                 wxr.wtp.debug(
                     f"Found unexpected group specifying a sense: {group}, head template {template_name}",
                     sortid="extractor/es/page/process_group/102",
                 )
 
-        elif isinstance(group[0], WikiNode) and group[0].kind == NodeKind.LIST:
+        elif kind == NodeKind.LIST:
             list_node = group[
                 0
             ]  # List groups seem to not be followed by string nodes. We, therefore, only process the list_node.
             process_sense_data_list(wxr, page_data[-1].senses[-1], list_node)
 
-        elif (
-            isinstance(child, WikiNode)
-            and child.kind == NodeKind.LINK
-            and "Categoría" in child.largs[0][0]
-        ):
+        elif kind == NodeKind.LINK and "Categoría" in group[0].largs[0][0]:
             # Extract sense categories
             clean_node(
                 wxr,
                 page_data[-1].senses[-1],
-                child,
+                group[0],
             )
 
         else:
@@ -1,6 +1,5 @@
-import re
 import string
-from collections import defaultdict
+from typing import Optional
 
 from wikitextprocessor import WikiNode
 from wiktextract.extractor.es.models import Sound, Spelling, WordEntry
@@ -8,27 +7,79 @@ from wiktextract.extractor.share import create_audio_url_dict
 from wiktextract.page import clean_node
 from wiktextract.wxr_context import WiktextractContext
 
+# pron-graf key names and the Sound fields their values are added to
+SOUND_KEY_FIELDS = {
+    "fone": "ipa",
+    "fono": "phonetic_transcription",
+    "tl": "roman",
+    "ts": "syllabic",
+    "pron": "tag",
+}
+# Placeholder values of pron-graf sound keys
+SKIPPED_SOUND_VALUES = {"fone": "...", "pron": "no"}
+# pron-graf key names, the Spelling field and whether the spelling has the
+# same pronunciation (grafía) or not (variante)
+SPELLING_KEY_FIELDS = {
+    "g": ("alternative", True),
+    "ga": ("alternative", True),
+    "grafía alternativa": ("alternative", True),
+    "gnota": ("note", True),
+    "v": ("alternative", False),
+    "variante": ("alternative", False),
+    "vnota": ("note", False),
+}
+
+
+def split_pron_graf_key(key: str) -> Optional[tuple[str, str, str]]:
+    """
+    Splits pron-graf parameter names like "fone2" or "2audio" into the
+    leading group number, the key name and the trailing variant number.
+    Returns None if the key has no name part.
+    """
+    length = len(key)
+    name_start = 0
+    while name_start < length and key[name_start].isdecimal():
+        name_start += 1
+    if name_start == length:
+        return None
+    name_end = name_start + 1
+    while name_end < length and not key[name_end].isdecimal():
+        name_end += 1
+    number_end = name_end
+    while number_end < length and key[number_end].isdecimal():
+        number_end += 1
+    return (
+        key[:name_start],
+        key[name_start:name_end],
+        key[name_end:number_end],
+    )
 
-def group_and_subgroup_keys(data):
-    pattern = re.compile(r"(\d*)(\D+)(\d*)")
 
-    grouped = defaultdict(lambda: defaultdict(list))
+def group_and_subgroup_keys(data):
+    grouped: dict[str, dict[str, list[str]]] = {}
 
-    for key in data.copy().keys():
+    for key in tuple(data.keys()):
         if isinstance(key, str):
-            match = pattern.match(key)
-            if match:
-                initial_digit = match.group(1) or "0"
-                last_digit = match.group(3) or "1"
-                grouped[initial_digit][last_digit].append(key)
+            key_parts = split_pron_graf_key(key)
+            if key_parts is not None:
+                initial_digit = key_parts[0] or "0"
+                last_digit = key_parts[2] or "1"
+                grouped.setdefault(initial_digit, {}).setdefault(
+                    last_digit, []
+                ).append(key)
 
         elif isinstance(key, int) and key == 1:
             data["fone"] = data[key]
-            grouped["0"]["1"].append("fone")
+            grouped.setdefault("0", {}).setdefault("1", []).append("fone")
 
     return grouped
 
 
+def sound_has_data(sound: Sound) -> bool:
+    # All Sound fields are lists that are empty by default
+    return any(value for _, value in sound)
+
+
 def process_pron_graf_template(
     wxr: WiktextractContext, word_entry: WordEntry, template_node: WikiNode
 ) -> None:
@@ -42,6 +93,7 @@ def process_pron_graf_template(
 
     for sound_keys in sound_keys_grouped.values():
         sound = Sound()
+        has_sound_data = False
         for variant_keys in sound_keys.values():
             spelling_g = Spelling(
                 same_pronunciation=True
@@ -49,46 +101,44 @@ def process_pron_graf_template(
             spelling_v = Spelling(
                 same_pronunciation=False
             )  # Collect different variants
+            has_spelling_g = False
+            has_spelling_v = False
             for key in variant_keys:
                 key_plain = key.strip(string.digits)
                 value_raw = template_node.template_parameters.get(key)
                 value = clean_node(wxr, {}, value_raw).strip()
-                if key_plain == "fone" and value != "...":
-                    sound.ipa.append(value)
-                elif key_plain == "fono":
-                    sound.phonetic_transcription.append(value)
-                elif key_plain == "tl":
-                    sound.roman.append(value)
-                elif key_plain == "ts":
-                    sound.syllabic.append(value)
-                elif key_plain == "pron":
-                    if value != "no":
-                        sound.tag.append(value)
+                if key_plain in SOUND_KEY_FIELDS:
+                    if value != SKIPPED_SOUND_VALUES.get(key_plain):
+                        getattr(sound, SOUND_KEY_FIELDS[key_plain]).append(
+                            value
+                        )
+                        has_sound_data = True
+                elif key_plain in SPELLING_KEY_FIELDS:
+                    field, same_pronunciation = SPELLING_KEY_FIELDS[key_plain]
+                    if same_pronunciation:
+                        setattr(spelling_g, field, value)
+                        has_spelling_g = True
+                    else:
+                        setattr(spelling_v, field, value)
+                        has_spelling_v = True
                 elif key_plain == "audio":
                     audio_url_dict = create_audio_url_dict(value)
                     for dict_key, dict_value in audio_url_dict.items():
                         if dict_value and dict_key in sound.model_fields:
                             getattr(sound, dict_key).append(dict_value)
-                elif key_plain in ["g", "ga", "grafía alternativa"]:
-                    spelling_g.alternative = value
-                elif key_plain == "gnota":
-                    spelling_g.note = value
-                elif key_plain in ["v", "variante"]:
-                    spelling_v.alternative = value
-                elif key_plain == "vnota":
-                    spelling_v.note = value
+                            has_sound_data = True
                 elif key not in ["leng"]:
                     wxr.wtp.debug(
                         f"Skipped extracting key {key} from pron-graf template",
                         sortid="extractor/es/pronunciation/extract_pronunciation/77",
                     )
 
-            if len(spelling_g.model_dump(exclude_defaults=True)) > 1:
+            if has_spelling_g:
                 spelling_data.append(spelling_g)
-            if len(spelling_v.model_dump(exclude_defaults=True)) > 1:
+            if has_spelling_v:
                 spelling_data.append(spelling_v)
 
-        if len(sound.model_dump(exclude_defaults=True)) > 0:
+        if has_sound_data:
             sound_data.append(sound)
 
     if len(sound_data) > 0:
@@ -111,5 +161,5 @@ def process_audio_template(
 
     # XXX: Extract other parameters from the Spanish audio template
 
-    if len(sound.model_dump(exclude_defaults=True)) > 0:
+    if sound_has_data(sound):
         word_entry.sounds.append(sound)
@@ -1,3 +1,5 @@
+from typing import Optional, Union
+
 from wikitextprocessor import NodeKind, WikiNode
 from wiktextract.extractor.es.example import process_example_list
 from wiktextract.extractor.es.linkage import process_linkage_list_children
@@ -5,6 +7,27 @@ from wiktextract.extractor.es.models import Sense
 from wiktextract.page import clean_node
 from wiktextract.wxr_context import WiktextractContext
 
+EXAMPLE_LIST_MARKERS = frozenset({"::", ":::"})
+
+# List types that are not extracted yet
+IGNORED_LIST_TYPES = frozenset({"ámbito", "uso"})
+
+
+def normalize_list_type(text: str) -> str:
+    return text.strip().removesuffix(":").removesuffix("s").lower()
+
+
+def plain_list_type(node: Union[WikiNode, str]) -> Optional[str]:
+    """
+    Returns the list type of a first child that is plain text or plain text
+    in a single formatting node, e.g. bold "Uso:", without cleaning it.
+    """
+    if isinstance(node, str):
+        return normalize_list_type(node)
+    if len(node.children) == 1 and isinstance(node.children[0], str):
+        return normalize_list_type(node.children[0])
+    return None
+
 
 def process_sense_data_list(
     wxr: WiktextractContext,
@@ -16,17 +39,13 @@ def process_sense_data_list(
     if list_marker == ":;":
         # XXX: Extract subsenses (rare!)
         pass
-    elif list_marker in [":*"]:
+    elif list_marker == ":*":
         for list_item in list_node.find_child(NodeKind.LIST_ITEM):
             children = list(list_item.filter_empty_str_child())
             # The first child will specify what data is listed
-            list_type = (
-                clean_node(wxr, {}, children[0])
-                .strip()
-                .removesuffix(":")
-                .removesuffix("s")
-                .lower()
-            )
+            if plain_list_type(children[0]) in IGNORED_LIST_TYPES:
+                continue
+            list_type = normalize_list_type(clean_node(wxr, {}, children[0]))
 
             if list_type == "ejemplo":
                 process_example_list(wxr, sense_data, list_item)
@@ -37,11 +56,8 @@ def process_sense_data_list(
                     children[1:],
                     wxr.config.LINKAGE_SUBTITLES.get(list_type),
                 )
-            elif list_type == "ámbito":
-                # XXX: Extract scope tag
-                pass
-            elif list_type == "uso":
-                # XXX: Extract usage note
+            elif list_type in IGNORED_LIST_TYPES:
+                # XXX: Extract scope tag and usage note
                 pass
             else:
                 wxr.wtp.debug(
@@ -49,7 +65,7 @@ def process_sense_data_list(
                     sortid="extractor/es/sense_data/process_sense_data_list/46",
                 )
 
-    elif list_marker in ["::", ":::"]:
+    elif list_marker in EXAMPLE_LIST_MARKERS:
         # E.g. https://es.wiktionary.org/wiki/silepsis
         for list_item in list_node.find_child_recursively(NodeKind.LIST_ITEM):
             process_example_list(wxr, sense_data, list_item)
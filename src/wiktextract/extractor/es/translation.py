@@ -6,6 +6,13 @@ from wiktextract.extractor.share import split_senseids
 from wiktextract.page import clean_node
 from wiktextract.wxr_context import WiktextractContext
 
+# Positional t+ parameters that are tags of the preceding translation
+TRANSLATION_TAGS = frozenset(
+    {"m", "f", "mf", "n", "c", "p", "adj", "sust", "adj y sust"}
+)
+# Positional t+ parameters that mark the meaning of the next parameter
+TRANSLATION_MARKERS = frozenset({"nota", "tr", "nl"})
+
 
 def extract_translation(
     wxr: WiktextractContext,
@@ -14,19 +21,32 @@ def extract_translation(
 ):
     # Documentation: https://es.wiktionary.org/wiki/Plantilla:t+
 
-    lang_code = template_node.template_parameters.get(1)  # Language code
+    params = template_node.template_parameters
+    lang_code = params.get(1)  # Language code
 
     # Initialize variables
     current_translation: Optional[Translation] = None
     senseids: list[str] = []
+    # Previous positional parameter, "nota" and "tr" apply to the next one
+    prev_key = None
+    prev_raw_value = None
+
+    for key, raw_value in params.items():
+        if isinstance(key, int):
+            marker = prev_raw_value if prev_key == key - 1 else None
+            prev_key = key
+            prev_raw_value = raw_value
 
-    for key in template_node.template_parameters.keys():
         if key == 1:
             continue  # Skip language code
+        if (
+            isinstance(key, int)
+            and isinstance(raw_value, str)
+            and raw_value.strip() in TRANSLATION_MARKERS
+        ):
+            continue  # Plain text marker, nothing to clean
 
-        value = clean_node(
-            wxr, {}, template_node.template_parameters[key]
-        ).strip()
+        value = clean_node(wxr, {}, raw_value).strip()
 
         if isinstance(key, int):
             if value == ",":
@@ -42,37 +62,15 @@ def extract_translation(
             ):
                 # This gives the senseids
                 senseids.extend(split_senseids(value))
-            elif value in [
-                "m",
-                "f",
-                "mf",
-                "n",
-                "c",
-                "p",
-                "adj",
-                "sust",
-                "adj y sust",
-            ]:
+            elif value in TRANSLATION_TAGS:
                 if current_translation:
                     current_translation.tags.append(value)
-            elif value in ["nota", "tr", "nl"]:
+            elif value in TRANSLATION_MARKERS:
                 continue
-            elif (
-                key > 2
-                and isinstance(
-                    template_node.template_parameters.get(key - 1), str
-                )
-                and template_node.template_parameters.get(key - 1) == "nota"
-            ):
+            elif key > 2 and marker == "nota":
                 if current_translation:
                     current_translation.notes.append(value)
-            elif (
-                key > 2
-                and isinstance(
-                    template_node.template_parameters.get(key - 1), str
-                )
-                and template_node.template_parameters.get(key - 1) == "tr"
-            ):
+            elif key > 2 and marker == "tr":
                 if current_translation:
                     current_translation.roman = value
             elif value != ",":
@@ -1,4 +1,3 @@
-import copy
 import logging
 from typing import Optional
 
@@ -9,6 +8,7 @@ from wiktextract.extractor.ru.linkage import extract_linkages
 from wiktextract.extractor.ru.models import WordEntry
 from wiktextract.extractor.ru.pronunciation import extract_pronunciation
 from wiktextract.extractor.ru.translation import extract_translations
+from wiktextract.extractor.share import copy_base_data
 from wiktextract.page import clean_node
 from wiktextract.wxr_context import WiktextractContext
 
@@ -240,14 +240,14 @@ def parse_page(
                 )
 
             for level2_node in level1_node.find_child(NodeKind.LEVEL2):
-                page_data.append(copy.deepcopy(base_data))
+                page_data.append(copy_base_data(base_data))
                 for level3_node in level2_node.find_child(NodeKind.LEVEL3):
                     parse_section(wxr, page_data, level3_node)
 
             is_first_level2_node = True
             for level3_node in level1_node.find_child(NodeKind.LEVEL3):
                 if is_first_level2_node:
-                    page_data.append(copy.deepcopy(base_data))
+                    page_data.append(copy_base_data(base_data))
                     is_first_level2_node = False
                 parse_section(wxr, page_data, level3_node)
 
@@ -1,10 +1,13 @@
 import hashlib
 import re
 from html import unescape
-from typing import Dict, Iterable, List, Optional, Tuple, Union
+from typing import Dict, Iterable, List, Optional, Tuple, TypeVar, Union
 
+from pydantic import BaseModel
 from wikitextprocessor import WikiNode
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
 
 def strip_nodes(
     nodes: List[Union[WikiNode, str]]
@@ -92,6 +95,22 @@ def split_tag_text(text: str) -> List[str]:
     ]
 
 
+def copy_base_data(base_data: ModelT) -> ModelT:
+    """
+    Copy data shared by several entries, e.g. the language and pronunciation
+    of a language section. Only the lists are copied, so that appending to
+    them doesn't affect other entries; list items and other values are shared
+    because they are not modified after they have been added.
+    """
+    return base_data.model_copy(
+        update={
+            field: list(value)
+            for field, value in base_data
+            if isinstance(value, list)
+        }
+    )
+
+
 def split_senseids(senseids_str: str) -> list[str]:
     senseids = []
     raw_ids = (
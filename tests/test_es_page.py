@@ -3,8 +3,12 @@ import unittest
 from wikitextprocessor import Wtp
 
 from wiktextract.config import WiktionaryConfig
-from wiktextract.extractor.es.models import WordEntry
-from wiktextract.extractor.es.page import parse_entries
+from wiktextract.extractor.es.models import Sense, Sound, WordEntry
+from wiktextract.extractor.es.page import (
+    parse_entries,
+    parse_section,
+    process_pos_block,
+)
 from wiktextract.wxr_context import WiktextractContext
 
 
@@ -49,3 +53,73 @@ class TestESPage(unittest.TestCase):
             page_data[0].sounds,
             base_data.sounds,
         )
+
+    def test_es_parse_entries_copies_base_data(self):
+        """
+        Data added to one entry doesn't leak into base_data or other entries.
+        """
+        self.wxr.wtp.start_page("love")
+
+        root = self.wxr.wtp.parse(
+            """== {{lengua|en}} ==
+{{pron-graf|leng=en|fone=lʌv}}
+=== {{verbo|en}} ===
+=== {{sustantivo|en}} ===
+"""
+        )
+
+        base_data = self.get_default_page_data()[0]
+        page_data = []
+
+        parse_entries(self.wxr, page_data, base_data, root.children[0])
+        sounds = list(page_data[1].sounds)
+        page_data[0].senses.append(Sense(glosses=["gloss"]))
+        page_data[0].categories.append("category")
+        page_data[0].sounds.append(Sound(ipa=["lʌv"]))
+
+        self.assertEqual(page_data[1].senses, [])
+        self.assertEqual(page_data[1].categories, [])
+        self.assertEqual(page_data[1].sounds, sounds)
+        self.assertEqual(base_data.senses, [])
+        self.assertEqual(base_data.categories, [])
+
+    def test_es_process_pos_block_sense_category(self):
+        # A category link group followed by another group
+        self.wxr.wtp.start_page("test")
+
+        root = self.wxr.wtp.parse(
+            ";1: gloss.\n[[Categoría:ES:Sentimientos]]\n{{clear}}"
+        )
+
+        page_data = self.get_default_page_data()
+
+        process_pos_block(self.wxr, page_data, root)
+
+        self.assertEqual(page_data[0].senses[0].categories, ["ES:Sentimientos"])
+
+    def test_es_parse_section_other_subtitles(self):
+        # Section titles are matched against the OTHER_SUBTITLES lists
+        self.wxr.wtp.start_page("gato")
+
+        root = self.wxr.wtp.parse(
+            """=== Véase también ===
+* {{t+|af|1|kat}}
+=== Traducciones ===
+* {{t+|af|1|kat}}
+"""
+        )
+
+        base_data = self.get_default_page_data()[0]
+        page_data = self.get_default_page_data()
+
+        parse_section(self.wxr, page_data, base_data, root.children[0])
+        self.assertEqual(page_data[0].translations, [])
+
+        parse_section(self.wxr, page_data, base_data, root.children[1])
+        self.assertEqual(
+            [
+                t.model_dump(exclude_defaults=True)
+                for t in page_data[0].translations
+            ],
+            [{"word": "kat", "lang_code": "af", "senseids": ["1"]}],
+        )
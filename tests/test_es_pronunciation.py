@@ -7,6 +7,7 @@ from wiktextract.extractor.es.models import WordEntry
 from wiktextract.extractor.es.pronunciation import (
     process_audio_template,
     process_pron_graf_template,
+    split_pron_graf_key,
 )
 from wiktextract.wxr_context import WiktextractContext
 
@@ -173,3 +174,10 @@ class TestESPronunciation(unittest.TestCase):
                 }
             ],
         )
+
+    def test_split_pron_graf_key(self):
+        self.assertEqual(split_pron_graf_key("fone"), ("", "fone", ""))
+        self.assertEqual(split_pron_graf_key("fone2"), ("", "fone", "2"))
+        self.assertEqual(split_pron_graf_key("2audio"), ("2", "audio", ""))
+        self.assertEqual(split_pron_graf_key("2fone3"), ("2", "fone", "3"))
+        self.assertIsNone(split_pron_graf_key("12"))
@@ -9,16 +9,17 @@ from wiktextract.wxr_context import WiktextractContext
 
 
 class TestLinkage(TestCase):
-    def setUp(self):
-        self.wxr = WiktextractContext(
+    # The tests add different templates, so they can share one database
+    @classmethod
+    def setUpClass(cls):
+        cls.wxr = WiktextractContext(
             Wtp(lang_code="zh"), WiktionaryConfig(dump_file_lang_code="zh")
         )
 
-    def tearDown(self):
-        self.wxr.wtp.close_db_conn()
-        close_thesaurus_db(
-            self.wxr.thesaurus_db_path, self.wxr.thesaurus_db_conn
-        )
+    @classmethod
+    def tearDownClass(cls):
+        cls.wxr.wtp.close_db_conn()
+        close_thesaurus_db(cls.wxr.thesaurus_db_path, cls.wxr.thesaurus_db_conn)
 
     def test_sense_term_list(self):
         page_data = [